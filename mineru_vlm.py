@@ -1,13 +1,25 @@
 # Copyright (c) Opendatalab. All rights reserved.
-import copy
 import json
 import os
+import sys
+import cProfile
 import logging
+import multiprocessing
+import threading
 from pathlib import Path
+from contextlib import nullcontext
+from functools import partial
+from typing import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
 from loguru import logger
 
+try:
+    import orjson
+except ImportError:  # orjson不可用时回退到标准库json
+    orjson = None
+
 from mineru.cli.common import convert_pdf_bytes_to_bytes_by_pypdfium2, prepare_env, read_fn
 from mineru.data.data_reader_writer import FileBasedDataWriter
 from mineru.utils.draw_bbox import draw_layout_bbox
@@ -17,10 +29,31 @@ from mineru.backend.vlm.vlm_middle_json_mkcontent import union_make as vlm_union
 from mineru.utils.models_download_utils import auto_download_and_get_model_root_path
 
 
+# 设置为目录时，对每个PDF的后处理阶段（union_make、绘制布局边界框等）做cProfile统计，结果写入该目录
+_PROFILE_DIR = os.getenv("MINERU_PROFILE_DIR")
+
+# orjson序列化选项（orjson只支持2空格缩进）
+_ORJSON_OPTION = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+# 回退到标准库json时的序列化参数（紧凑格式）
+_JSON_DUMP_KW = dict(ensure_ascii=False, separators=(",", ":"))
+
+# 模型输出文件中各页结果之间的分隔线
+_MODEL_OUTPUT_SEP = "\n" + "-" * 50 + "\n"
+
+# 后处理子进程的启动方式：主进程持有CUDA上下文和loguru的后台写日志线程，fork出的子进程不安全
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# setup_logging创建的日志文件；为None时日志处理器未经setup_logging配置，不能传给子进程
+_LOG_FILE = None
+
+
 def setup_logging(log_dir="logs"):
     """
     设置日志配置，将mineru的日志输出到文件
     """
+    global _LOG_FILE
+    
     # 创建logs目录
     os.makedirs(log_dir, exist_ok=True)
     
@@ -30,17 +63,296 @@ def setup_logging(log_dir="logs"):
     
     # 配置loguru，将日志输出到文件和控制台
     logger.remove()  # 移除默认的处理器
-    logger.add(log_file, level="INFO", format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}")
-    logger.add(lambda msg: print(msg, end=""), level="INFO", format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}")
+    # enqueue=True：日志记录经队列交给后台线程写出，不阻塞主循环，并保证多进程写入安全
+    # 队列与后处理进程池使用同一种启动方式创建，才能传给子进程
+    logger.add(log_file, level="INFO", format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}", enqueue=True, context=_MP_CONTEXT)
+    logger.add(sys.stderr, level="INFO", format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}", enqueue=True, context=_MP_CONTEXT)
+    _LOG_FILE = log_file
     
     logger.info(f"日志文件已创建: {log_file}")
     return log_file
 
 
+def _call_maybe_profiled(stats_name, func, *args):
+    """
+    调用func(*args)；设置了MINERU_PROFILE_DIR时用cProfile统计该次调用，
+    统计结果写入 {MINERU_PROFILE_DIR}/{stats_name}，可用pstats或snakeviz查看
+    """
+    if not _PROFILE_DIR:
+        return func(*args)
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args)
+    finally:
+        os.makedirs(_PROFILE_DIR, exist_ok=True)
+        profiler.dump_stats(os.path.join(_PROFILE_DIR, stats_name))
+
+
+def _forward_log(main_logger, message):
+    """
+    将子进程中的一条日志转交给主进程的日志处理器
+    """
+    record = message.record
+    main_logger.opt(exception=record["exception"]).log(record["level"].name, record["message"])
+
+
+def _init_postprocess_worker(main_logger):
+    """
+    后处理子进程的初始化函数
+    spawn出的子进程没有主进程配置的日志处理器，将子进程中的日志（包括mineru内部的日志）转发给主进程
+    """
+    if main_logger is None:
+        return
+    logger.remove()
+    logger.add(partial(_forward_log, main_logger), level="INFO", format="{message}")
+
+
+class PostprocessPool:
+    """
+    后处理进程池，一次运行只创建一个，在各批次、各文件夹之间复用
+    提交任务后不等待其完成，上一批的后处理与下一批的VLM推理重叠；
+    已提交但未完成的任务数量有上限，避免推理快于后处理时中间结果在内存中堆积
+    """
+
+    def __init__(self, max_workers=None, max_pending=None):
+        if max_workers is None:
+            max_workers = max(1, min(os.cpu_count() or 1, 4))
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=_MP_CONTEXT,
+            initializer=_init_postprocess_worker,
+            initargs=(logger if _LOG_FILE is not None else None,),
+        )
+        self._slots = threading.BoundedSemaphore(max_pending or 2 * max_workers)
+
+    def submit(self, pdf_file_name, func, *args) -> None:
+        """
+        提交一个文件的后处理任务，未完成的任务达到上限时阻塞等待
+        任务完成后记录结果日志
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(partial(self._on_done, pdf_file_name))
+
+    def _on_done(self, pdf_file_name, future) -> None:
+        self._slots.release()
+        try:
+            local_md_dir = future.result()
+            logger.info(f"文件 {pdf_file_name} 解析完成，输出目录: {local_md_dir}")
+        except Exception as e:
+            logger.error(f"解析文件 {pdf_file_name} 时发生错误: {str(e)}")
+
+    def shutdown(self) -> None:
+        """
+        等待所有已提交的后处理任务完成并关闭进程池
+        """
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+
+class StreamingDataWriter(FileBasedDataWriter):
+    """
+    在FileBasedDataWriter的基础上增加直接写出JSON的方法，避免先在内存中拼出完整的JSON字符串
+    """
+
+    def _resolve_path(self, path: str) -> str:
+        """
+        与FileBasedDataWriter.write相同的路径处理：相对路径拼接到parent_dir下，并确保所在目录存在
+        """
+        fn_path = path
+        if not os.path.isabs(fn_path) and len(self._parent_dir) > 0:
+            fn_path = os.path.join(self._parent_dir, path)
+
+        if not os.path.exists(os.path.dirname(fn_path)) and os.path.dirname(fn_path) != "":
+            os.makedirs(os.path.dirname(fn_path), exist_ok=True)
+
+        return fn_path
+
+    def write(self, path: str, data: bytes) -> None:
+        with open(self._resolve_path(path), "wb") as f:
+            f.write(data)
+
+    def write_json(self, path: str, obj) -> None:
+        """
+        将对象序列化为JSON写入文件
+        orjson直接返回bytes，无需再做str->bytes编码；不可用时用json.dump分块写入缓冲文件
+        """
+        if orjson is not None:
+            self.write(path, orjson.dumps(obj, option=_ORJSON_OPTION))
+        else:
+            self._stream_json(path, obj)
+
+    def _stream_json(self, path: str, obj) -> None:
+        """
+        用json.dump将对象分块写入缓冲文件，不在内存中生成完整的JSON字符串
+        """
+        with open(self._resolve_path(path), "w", encoding="utf-8", errors="replace", buffering=1024 * 1024) as f:
+            json.dump(obj, f, **_JSON_DUMP_KW)
+
+
+class BatchedDataWriter(StreamingDataWriter):
+    """
+    将单个PDF的输出文件提交到线程池中并发写出，作为上下文管理器使用，退出时等待全部写入完成；
+    即使处理过程中出错，退出时也会等待已提交的写入结束并关闭线程池
+    每个文件在生成后立即提交写入，写完即释放对应的数据，不会把所有输出同时留在内存中；
+    输出目录位于网络存储（csi-s3）上时，多个文件的写入可以相互重叠，而不是逐个等待
+    """
+
+    def __init__(self, parent_dir: str = '', max_workers: int = 8) -> None:
+        super().__init__(parent_dir)
+        self._max_workers = max_workers
+        self._executor = None
+        self._futures = []
+
+    def _submit(self, func, *args) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        self._futures.append(self._executor.submit(func, *args))
+
+    def write(self, path: str, data: bytes) -> None:
+        """
+        提交写入任务，不等待写入完成
+        """
+        self._submit(super().write, path, data)
+
+    def _stream_json(self, path: str, obj) -> None:
+        """
+        不使用orjson时，json.dump的流式写出同样提交到线程池中执行
+        """
+        self._submit(super()._stream_json, path, obj)
+
+    def flush(self) -> None:
+        """
+        等待所有已提交的写入完成，写入出错时抛出异常
+        """
+        futures, self._futures = self._futures, []
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.flush()
+        except Exception:
+            # 已有异常向外传播时不用写入错误覆盖它
+            if exc_type is None:
+                raise
+
+
+def expected_output_names(pdf_file_name, cfg) -> set[str]:
+    """
+    根据启用的输出选项，返回该PDF在文档输出目录（{pdf_name}/vlm/）中应生成的文件名集合
+    cfg中未给出的输出选项按do_parse的默认值（启用）处理
+    """
+    output_flags = [
+        ("f_draw_layout_bbox", f"{pdf_file_name}_layout.pdf"),
+        ("f_dump_orig_pdf", f"{pdf_file_name}_origin.pdf"),
+        ("f_dump_md", f"{pdf_file_name}.md"),
+        ("f_dump_content_list", f"{pdf_file_name}_content_list.json"),
+        ("f_dump_middle_json", f"{pdf_file_name}_middle.json"),
+        ("f_dump_model_output", f"{pdf_file_name}_model_output.txt"),
+    ]
+    names = {name for flag, name in output_flags if cfg.get(flag, True)}
+    # 非Markdown模式下不会生成.md文件（见_parse_one），不能因此反复重新解析
+    if cfg.get("f_make_md_mode", MakeMode.MM_MD) not in (MakeMode.MM_MD, MakeMode.NLP_MD):
+        names.discard(f"{pdf_file_name}.md")
+    return names
+
+
+def _parse_one(pdf_bytes, pdf_file_name, cfg):
+    """
+    处理单个PDF的VLM后处理阶段（绘制布局、生成Markdown/内容列表、写出JSON等）
+    该函数定义在模块级别，以便可以被ProcessPoolExecutor序列化后在子进程中执行
+    """
+    middle_json = cfg["middle_json"]
+    infer_result = cfg["infer_result"]
+    local_image_dir = cfg["local_image_dir"]
+    local_md_dir = cfg["local_md_dir"]
+
+    # 获取PDF信息
+    pdf_info = middle_json["pdf_info"]
+    logger.debug("PDF信息提取完成，共 {} 页", len(pdf_info))
+
+    # 绘制布局边界框与其余输出互不依赖，放到后台线程中与JSON/Markdown输出并行执行
+    # pdf_info在此之后只会被读取，两边可以安全共享
+    # 退出with块时等待所有输出文件写入完成
+    with BatchedDataWriter(local_md_dir) as md_writer, ThreadPoolExecutor(max_workers=1) as bbox_executor:
+        bbox_future = None
+        if cfg["f_draw_layout_bbox"]:
+            bbox_args = (pdf_info, pdf_bytes, local_md_dir, f"{pdf_file_name}_layout.pdf")
+            if _PROFILE_DIR:
+                # 性能分析时在当前线程中绘制，计入_parse_one的同一个profiler
+                # （同一进程同时只能启用一个cProfile，Python 3.12+中嵌套启用会报错）
+                draw_layout_bbox(*bbox_args)
+                logger.debug("布局边界框绘制完成")
+            else:
+                bbox_future = bbox_executor.submit(draw_layout_bbox, *bbox_args)
+
+        # 保存原始PDF文件（如果启用）
+        if cfg["f_dump_orig_pdf"]:
+            md_writer.write(f"{pdf_file_name}_origin.pdf", pdf_bytes)
+            logger.debug("原始PDF文件保存完成")
+
+        image_dir = os.path.basename(local_image_dir)
+
+        # 生成并保存Markdown文件（如果启用）
+        if cfg["f_dump_md"]:
+            md_content_str = vlm_union_make(pdf_info, cfg["f_make_md_mode"], image_dir)
+            # f_make_md_mode为CONTENT_LIST等模式时union_make返回的不是字符串，
+            # 与write_string的行为一致：只跳过.md文件，其余输出照常写出
+            if isinstance(md_content_str, str):
+                md_writer.write(f"{pdf_file_name}.md", md_content_str.encode("utf-8", errors="replace"))
+                logger.debug("Markdown文件保存完成")
+            else:
+                logger.warning(f"Markdown模式 {cfg['f_make_md_mode']} 生成的内容不是字符串，跳过 {pdf_file_name}.md")
+
+        # 生成并保存内容列表（如果启用）
+        if cfg["f_dump_content_list"]:
+            content_list = vlm_union_make(pdf_info, MakeMode.CONTENT_LIST, image_dir)
+            md_writer.write_json(f"{pdf_file_name}_content_list.json", content_list)
+            logger.debug("内容列表保存完成")
+
+        # 保存中间JSON文件（如果启用）
+        if cfg["f_dump_middle_json"]:
+            md_writer.write_json(f"{pdf_file_name}_middle.json", middle_json)
+            logger.debug("中间JSON文件保存完成")
+
+        # 保存模型输出（如果启用）
+        if cfg["f_dump_model_output"]:
+            model_output = _MODEL_OUTPUT_SEP.join(infer_result)
+            md_writer.write(f"{pdf_file_name}_model_output.txt", model_output.encode("utf-8", errors="replace"))
+            logger.debug("模型输出保存完成")
+
+        # 等待布局边界框绘制完成
+        if bbox_future is not None:
+            bbox_future.result()
+            logger.debug("布局边界框绘制完成")
+
+    return local_md_dir
+
+
 def do_parse(
     output_dir,  # 输出目录，用于存储解析结果
-    pdf_file_names: list[str],  # PDF文件名列表
-    pdf_bytes_list: list[bytes],  # PDF字节数据列表
+    pdf_inputs: Iterable[tuple[str, Callable[[], bytes]]],  # (PDF文件名, 读取PDF字节数据的函数) 列表，按需读取
     p_lang_list: list[str],  # 每个PDF的语言列表，默认为'en'
     backend="vlm-transformers",  # 解析PDF的后端，使用vlm-transformers加速
     formula_enable=True,  # 启用公式解析
@@ -55,13 +367,20 @@ def do_parse(
     f_make_md_mode=MakeMode.MM_MD,  # 制作markdown内容的模式
     start_page_id=0,  # 开始页面ID
     end_page_id=None,  # 结束页面ID
+    postprocess_pool: PostprocessPool | None = None,  # 复用的后处理进程池，为None时在本次调用内创建
 ):
     """
     执行PDF解析的主要函数
     使用vlm-transformers后端进行加速解析
+    VLM推理占用GPU，在主进程中逐个文件执行；后处理（绘制布局、序列化、写文件）
+    提交到进程池中并行执行，与下一个文件的推理重叠
+    传入postprocess_pool时只提交后处理任务、不等待其完成；否则在返回前等待本次调用的全部后处理完成
+    PDF字节数据在处理到对应文件时才读取；已提交的文件的字节数据和中间JSON
+    由进程池的待处理任务引用，直到该文件的后处理完成
     """
+    pdf_inputs = list(pdf_inputs)
     
-    logger.info(f"开始解析 {len(pdf_file_names)} 个PDF文件")
+    logger.info(f"开始解析 {len(pdf_inputs)} 个PDF文件")
     logger.info(f"使用后端: {backend}")
     logger.info(f"输出目录: {output_dir}")
     
@@ -69,90 +388,83 @@ def do_parse(
     if backend == "vlm-transformers":
         logger.info("使用VLM-Transformers后端进行解析...")
         
-        # 遍历每个PDF文件进行解析
-        for idx, pdf_bytes in enumerate(pdf_bytes_list):
-            pdf_file_name = pdf_file_names[idx]
-            logger.info(f"正在解析文件 {idx+1}/{len(pdf_file_names)}: {pdf_file_name}")
-            
-            try:
-                # 转换PDF字节数据（如果指定了页面范围）
-                if start_page_id > 0 or end_page_id is not None:
-                    pdf_bytes = convert_pdf_bytes_to_bytes_by_pypdfium2(pdf_bytes, start_page_id, end_page_id)
-                    logger.info(f"已转换PDF页面范围: {start_page_id} 到 {end_page_id if end_page_id else '末尾'}")
-                
-                # 准备输出环境
-                local_image_dir, local_md_dir = prepare_env(output_dir, pdf_file_name, "vlm")
-                image_writer, md_writer = FileBasedDataWriter(local_image_dir), FileBasedDataWriter(local_md_dir)
-                
-                logger.info(f"图片输出目录: {local_image_dir}")
-                logger.info(f"文档输出目录: {local_md_dir}")
-                
-                # 使用VLM进行文档分析
-                logger.info("开始VLM文档分析...")
-                middle_json, infer_result = vlm_doc_analyze(
-                    pdf_bytes, 
-                    image_writer=image_writer, 
-                    backend="transformers",  # 使用transformers后端
-                    server_url=server_url
-                )
-                logger.info("VLM文档分析完成")
-                
-                # 获取PDF信息
-                pdf_info = middle_json["pdf_info"]
-                logger.info(f"PDF信息提取完成，共 {len(pdf_info)} 页")
-                
-                # 绘制布局边界框（如果启用）
-                if f_draw_layout_bbox:
-                    logger.info("正在绘制布局边界框...")
-                    draw_layout_bbox(pdf_info, pdf_bytes, local_md_dir, f"{pdf_file_name}_layout.pdf")
-                    logger.info("布局边界框绘制完成")
-                                
-                # 保存原始PDF文件（如果启用）
-                if f_dump_orig_pdf:
-                    logger.info("正在保存原始PDF文件...")
-                    md_writer.write(f"{pdf_file_name}_origin.pdf", pdf_bytes)
-                    logger.info("原始PDF文件保存完成")
-                
-                # 生成并保存Markdown文件（如果启用）
-                if f_dump_md:
-                    logger.info("正在生成Markdown文件...")
-                    image_dir = str(os.path.basename(local_image_dir))
-                    md_content_str = vlm_union_make(pdf_info, f_make_md_mode, image_dir)
-                    md_writer.write_string(f"{pdf_file_name}.md", md_content_str)
-                    logger.info("Markdown文件生成完成")
+        # 后处理阶段共用的配置
+        dump_cfg = {
+            "f_draw_layout_bbox": f_draw_layout_bbox,
+            "f_dump_md": f_dump_md,
+            "f_dump_middle_json": f_dump_middle_json,
+            "f_dump_model_output": f_dump_model_output,
+            "f_dump_orig_pdf": f_dump_orig_pdf,
+            "f_dump_content_list": f_dump_content_list,
+            "f_make_md_mode": f_make_md_mode,
+        }
+        
+        # 没有启用任何输出时，VLM分析的结果不会被使用，直接跳过
+        if not (f_draw_layout_bbox or f_dump_md or f_dump_middle_json
+                or f_dump_model_output or f_dump_orig_pdf or f_dump_content_list):
+            logger.warning("未启用任何输出选项，跳过VLM分析")
+            return
+        
+        # 性能统计文件名带上输出子目录名，避免不同日期文件夹中的同名PDF互相覆盖
+        output_dir_name = os.path.basename(os.path.normpath(output_dir))
+        if postprocess_pool is None:
+            pool_context = PostprocessPool(max_workers=max(1, min(os.cpu_count() or 1, 4, len(pdf_inputs))))
+        else:
+            pool_context = nullcontext(postprocess_pool)
+        with pool_context as pool:
+            # 遍历每个PDF文件进行解析
+            for idx, (pdf_file_name, read_pdf_bytes) in enumerate(pdf_inputs):
+                logger.info(f"正在解析文件 {idx+1}/{len(pdf_inputs)}: {pdf_file_name}")
                 
-                # 生成并保存内容列表（如果启用）
-                if f_dump_content_list:
-                    logger.info("正在生成内容列表...")
-                    image_dir = str(os.path.basename(local_image_dir))
-                    content_list = vlm_union_make(pdf_info, MakeMode.CONTENT_LIST, image_dir)
-                    md_writer.write_string(
-                        f"{pdf_file_name}_content_list.json",
-                        json.dumps(content_list, ensure_ascii=False, indent=4),
+                try:
+                    # 准备输出环境
+                    local_image_dir, local_md_dir = prepare_env(output_dir, pdf_file_name, "vlm")
+                    image_writer = FileBasedDataWriter(local_image_dir)
+                    
+                    logger.debug("图片输出目录: {}", local_image_dir)
+                    logger.debug("文档输出目录: {}", local_md_dir)
+                    
+                    # 所有需要的输出文件都已存在时（例如上次运行中断前已完成），跳过读取和VLM分析
+                    expected_names = expected_output_names(pdf_file_name, dump_cfg)
+                    if expected_names.issubset(os.listdir(local_md_dir)):
+                        logger.info(f"文件 {pdf_file_name} 的所有输出文件均已存在，跳过")
+                        continue
+                    
+                    # 读取PDF字节数据
+                    pdf_bytes = read_pdf_bytes()
+                    logger.debug("文件 {} 读取成功，大小: {} 字节", pdf_file_name, len(pdf_bytes))
+                    
+                    # 转换PDF字节数据（如果指定了页面范围）
+                    if start_page_id > 0 or end_page_id is not None:
+                        pdf_bytes = convert_pdf_bytes_to_bytes_by_pypdfium2(pdf_bytes, start_page_id, end_page_id)
+                        logger.debug("已转换PDF页面范围: {} 到 {}", start_page_id, end_page_id if end_page_id else '末尾')
+                    
+                    # 使用VLM进行文档分析（GPU操作，保留在主进程中）
+                    logger.debug("开始VLM文档分析: {}", pdf_file_name)
+                    middle_json, infer_result = vlm_doc_analyze(
+                        pdf_bytes, 
+                        image_writer=image_writer, 
+                        backend="transformers",  # 使用transformers后端
+                        server_url=server_url
                     )
-                    logger.info("内容列表生成完成")
-                
-                # 保存中间JSON文件（如果启用）
-                if f_dump_middle_json:
-                    logger.info("正在保存中间JSON文件...")
-                    md_writer.write_string(
-                        f"{pdf_file_name}_middle.json",
-                        json.dumps(middle_json, ensure_ascii=False, indent=4),
+                    logger.debug("文件 {} VLM文档分析完成", pdf_file_name)
+                    
+                    # 将后处理提交到进程池，与下一个文件的VLM推理重叠
+                    cfg = dict(
+                        dump_cfg,
+                        middle_json=middle_json,
+                        infer_result=infer_result,
+                        local_image_dir=local_image_dir,
+                        local_md_dir=local_md_dir,
                     )
-                    logger.info("中间JSON文件保存完成")
-                
-                # 保存模型输出（如果启用）
-                if f_dump_model_output:
-                    logger.info("正在保存模型输出...")
-                    model_output = ("\n" + "-" * 50 + "\n").join(infer_result)
-                    md_writer.write_string(f"{pdf_file_name}_model_output.txt", model_output)
-                    logger.info("模型输出保存完成")
-                
-                logger.info(f"文件 {pdf_file_name} 解析完成，输出目录: {local_md_dir}")
-                
-            except Exception as e:
-                logger.error(f"解析文件 {pdf_file_name} 时发生错误: {str(e)}")
-                continue
+                    pool.submit(
+                        pdf_file_name, _call_maybe_profiled, f"{output_dir_name}_{pdf_file_name}_postprocess.prof",
+                        _parse_one, pdf_bytes, pdf_file_name, cfg
+                    )
+                    
+                except Exception as e:
+                    logger.error(f"解析文件 {pdf_file_name} 时发生错误: {str(e)}")
+                    continue
     
     else:
         logger.error(f"不支持的backend: {backend}，请使用 'vlm-transformers'")
@@ -177,6 +489,7 @@ def parse_doc(
     f_dump_orig_pdf=True,  # 是否输出原始PDF文件
     f_dump_content_list=True,  # 是否输出内容列表文件
     f_make_md_mode=MakeMode.MM_MD,  # 制作markdown内容的模式
+    postprocess_pool: PostprocessPool | None = None,  # 复用的后处理进程池，为None时在本次调用内创建
 ):
     """
     解析文档的主函数（批处理版本）
@@ -201,6 +514,8 @@ def parse_doc(
     f_dump_orig_pdf: 是否输出原始PDF文件，默认True
     f_dump_content_list: 是否输出内容列表文件，默认True
     f_make_md_mode: 制作markdown内容的模式，默认MM_MD
+    postprocess_pool: 后处理进程池，各批次共用，上一批的后处理与下一批的VLM推理重叠；
+                      为None时在本次调用内创建，并在返回前等待全部后处理完成
     """
     try:
         logger.info(f"开始批量解析文档，共 {len(path_list)} 个文件")
@@ -226,69 +541,55 @@ def parse_doc(
         total_batches = (len(path_list) + batch_size - 1) // batch_size
         logger.info(f"将分 {total_batches} 批进行处理")
         
-        for batch_idx in range(total_batches):
-            start_idx = batch_idx * batch_size
-            end_idx = min(start_idx + batch_size, len(path_list))
-            current_batch = path_list[start_idx:end_idx]
-            
-            logger.info(f"开始处理第 {batch_idx + 1}/{total_batches} 批，文件 {start_idx + 1}-{end_idx}")
-            
-            # 准备当前批次的文件
-            file_name_list = []
-            pdf_bytes_list = []
-            lang_list = []
-            
-            for path in current_batch:
-                file_name = str(Path(path).stem)
-                logger.info(f"准备解析文件: {file_name}")
+        if postprocess_pool is None:
+            pool_context = PostprocessPool()
+        else:
+            pool_context = nullcontext(postprocess_pool)
+        with pool_context as pool:
+            for batch_idx in range(total_batches):
+                start_idx = batch_idx * batch_size
+                end_idx = min(start_idx + batch_size, len(path_list))
+                current_batch = path_list[start_idx:end_idx]
                 
-                try:
-                    pdf_bytes = read_fn(path)
-                    file_name_list.append(file_name)
-                    pdf_bytes_list.append(pdf_bytes)
+                logger.info(f"开始处理第 {batch_idx + 1}/{total_batches} 批，文件 {start_idx + 1}-{end_idx}")
+                
+                # 准备当前批次的文件（只记录读取函数，文件内容在do_parse中按需读取）
+                pdf_inputs = []
+                lang_list = []
+                
+                for path in current_batch:
+                    file_name = str(Path(path).stem)
+                    logger.debug("准备解析文件: {}", file_name)
+                    pdf_inputs.append((file_name, partial(read_fn, path)))
                     lang_list.append(lang)
-                    logger.info(f"文件 {file_name} 读取成功，大小: {len(pdf_bytes)} 字节")
-                except Exception as e:
-                    logger.error(f"读取文件 {file_name} 失败: {str(e)}")
-                    continue
-            
-            if not file_name_list:
-                logger.warning(f"第 {batch_idx + 1} 批没有成功读取的文件，跳过")
-                continue
-            
-            logger.info(f"第 {batch_idx + 1} 批成功准备 {len(file_name_list)} 个文件进行解析")
-            
-            # 执行当前批次的解析，传递所有参数
-            do_parse(
-                output_dir=output_dir,
-                pdf_file_names=file_name_list,
-                pdf_bytes_list=pdf_bytes_list,
-                p_lang_list=lang_list,
-                backend=backend,
-                formula_enable=formula_enable,
-                table_enable=table_enable,
-                server_url=server_url,
-                f_draw_layout_bbox=f_draw_layout_bbox,
-                f_dump_md=f_dump_md,
-                f_dump_middle_json=f_dump_middle_json,
-                f_dump_model_output=f_dump_model_output,
-                f_dump_orig_pdf=f_dump_orig_pdf,
-                f_dump_content_list=f_dump_content_list,
-                f_make_md_mode=f_make_md_mode,
-                start_page_id=start_page_id,
-                end_page_id=end_page_id
-            )
-            
-            # 清理当前批次的内存
-            del file_name_list, pdf_bytes_list, lang_list
-            logger.info(f"第 {batch_idx + 1} 批处理完成，已清理内存")
+                
+                logger.info(f"第 {batch_idx + 1} 批成功准备 {len(pdf_inputs)} 个文件进行解析")
+                
+                # 执行当前批次的解析，传递所有参数
+                do_parse(
+                    output_dir=output_dir,
+                    pdf_inputs=pdf_inputs,
+                    p_lang_list=lang_list,
+                    backend=backend,
+                    formula_enable=formula_enable,
+                    table_enable=table_enable,
+                    server_url=server_url,
+                    f_draw_layout_bbox=f_draw_layout_bbox,
+                    f_dump_md=f_dump_md,
+                    f_dump_middle_json=f_dump_middle_json,
+                    f_dump_model_output=f_dump_model_output,
+                    f_dump_orig_pdf=f_dump_orig_pdf,
+                    f_dump_content_list=f_dump_content_list,
+                    f_make_md_mode=f_make_md_mode,
+                    start_page_id=start_page_id,
+                    end_page_id=end_page_id,
+                    postprocess_pool=pool,
+                )
+                
+                # 清理当前批次的内存
+                del pdf_inputs, lang_list
+                logger.info(f"第 {batch_idx + 1} 批处理完成，已清理内存")
             
-            # 可选：在批次之间添加短暂休息，避免系统过载
-            if batch_idx < total_batches - 1:
-                logger.info("等待2秒后处理下一批...")
-                import time
-                time.sleep(2)
-        
         logger.info("所有批次处理完成！")
         
     except Exception as e:
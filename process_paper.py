@@ -8,13 +8,19 @@ Mineru PDF批量解析主程序
 import os
 import re
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import numpy as np
 from loguru import logger
 
-from mineru_vlm import setup_logging, parse_doc
+from mineru_vlm import setup_logging, parse_doc, expected_output_names, PostprocessPool
 from mineru.utils.enum_class import MakeMode
 
 
+# 文件夹名中的日期格式 YYYY-MM-DD
+_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+
+
 def extract_date_from_folder_name(folder_name: str) -> datetime:
     """
     从文件夹名称中提取日期信息
@@ -22,9 +28,14 @@ def extract_date_from_folder_name(folder_name: str) -> datetime:
     返回第一个日期作为排序依据
     """
     try:
+        # 快速路径：文件夹名以 YYYY-MM-DD 开头时直接截取前10个字符解析
+        try:
+            return datetime.strptime(folder_name[:10], '%Y-%m-%d')
+        except ValueError:
+            pass
+        
         # 使用正则表达式匹配日期格式 YYYY-MM-DD
-        date_pattern = r'(\d{4}-\d{2}-\d{2})'
-        dates = re.findall(date_pattern, folder_name)
+        dates = _DATE_RE.findall(folder_name)
         
         if dates:
             # 取第一个日期进行排序
@@ -45,31 +56,58 @@ def sort_folders_by_date_desc(folder_paths: list[Path]) -> list[Path]:
     按日期倒序排序文件夹路径
     最新日期的文件夹排在前面
     """
-    # 创建(文件夹路径, 日期)的元组列表
-    folder_date_pairs = []
-    for path in folder_paths:
-        folder_name = path.name
-        date = extract_date_from_folder_name(folder_name)
-        folder_date_pairs.append((path, date))
+    # 每个文件夹只提取一次日期，并转换为int64排序键
+    dates = [extract_date_from_folder_name(path.name) for path in folder_paths]
+    keys = np.fromiter((int(date.timestamp()) for date in dates), dtype=np.int64, count=len(dates))
     
-    # 按日期倒序排序
-    folder_date_pairs.sort(key=lambda x: x[1], reverse=True)
+    # 按日期倒序排序（稳定排序，日期相同的文件夹保持原有顺序）
+    order = np.argsort(-keys, kind='stable').tolist()
     
     # 提取排序后的文件夹路径
-    sorted_paths = [pair[0] for pair in folder_date_pairs]
+    sorted_paths = [folder_paths[i] for i in order]
     
     # 打印排序结果
     logger.info("=== 文件夹按日期倒序排序结果 ===")
-    for i, (path, date) in enumerate(folder_date_pairs):
+    for rank, i in enumerate(order):
+        path, date = folder_paths[i], dates[i]
         if date.year > 1900:
-            logger.info(f"{i+1:2d}. {path.name} (日期: {date.strftime('%Y-%m-%d')})")
+            logger.info(f"{rank+1:2d}. {path.name} (日期: {date.strftime('%Y-%m-%d')})")
         else:
-            logger.info(f"{i+1:2d}. {path.name} (日期: 未知)")
+            logger.info(f"{rank+1:2d}. {path.name} (日期: 未知)")
     logger.info("==================================")
     
     return sorted_paths
 
 
+def _list_vlm_outputs(output_pdf_dir: str) -> set[str]:
+    """
+    列出单个PDF的输出目录下vlm子文件夹中已有的文件名
+    """
+    vlm_dir = os.path.join(output_pdf_dir, 'vlm')
+    try:
+        with os.scandir(vlm_dir) as it:
+            return {e.name for e in it if e.is_file()}
+    except (FileNotFoundError, NotADirectoryError):
+        # vlm子文件夹不存在，记录调试信息
+        logger.debug(f"  - {os.path.basename(output_pdf_dir)} 的vlm子文件夹不存在: {vlm_dir}")
+        return set()
+
+
+def _build_parsed_index(output_subfolder: Path) -> dict[str, set[str]]:
+    """
+    扫描一次输出子目录，建立已解析结果的索引
+    解析结果存储在 {output_subfolder}/{pdf_name}/vlm/ 子文件夹中
+    返回 {pdf_name: vlm子文件夹中已有的文件名集合}，没有输出目录的PDF不在索引中
+    """
+    with os.scandir(output_subfolder) as it:
+        pdf_output_dirs = [(e.name, e.path) for e in it if e.is_dir()]
+    
+    # 各PDF的vlm子文件夹检查互不依赖，在线程池中并发执行以重叠文件系统延迟
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        outputs_list = executor.map(_list_vlm_outputs, [path for _, path in pdf_output_dirs])
+        return {name: outputs for (name, _), outputs in zip(pdf_output_dirs, outputs_list)}
+
+
 def process_folder_structure(
     input_root_dir: str,
     output_root_dir: str,
@@ -83,7 +121,7 @@ def process_folder_structure(
     input_root_dir: 输入根目录（包含子文件夹）
     output_root_dir: 输出根目录
     batch_size: 批处理大小
-    **parsing_config: 解析配置参数
+    **parsing_config: 解析配置参数，原样传给parse_doc（可包含postprocess_pool，在各文件夹之间共用后处理进程池）
     """
     input_path = Path(input_root_dir)
     output_path = Path(output_root_dir)
@@ -96,7 +134,8 @@ def process_folder_structure(
     output_path.mkdir(parents=True, exist_ok=True)
     
     # 获取所有子文件夹
-    subfolders = [f for f in input_path.iterdir() if f.is_dir()]
+    with os.scandir(input_path) as it:
+        subfolders = [Path(e.path) for e in it if e.is_dir()]
     
     if not subfolders:
         logger.warning(f"在 {input_root_dir} 中没有找到子文件夹")
@@ -122,7 +161,8 @@ def process_folder_structure(
         output_subfolder.mkdir(exist_ok=True)
         
         # 查找当前子文件夹中的所有PDF文件
-        pdf_files = list(subfolder.glob('*.pdf'))
+        with os.scandir(subfolder) as it:
+            pdf_files = [Path(e.path) for e in it if e.is_file() and e.name.endswith('.pdf')]
         
         if not pdf_files:
             logger.warning(f"文件夹 {subfolder.name} 中没有找到PDF文件，跳过")
@@ -136,34 +176,21 @@ def process_folder_structure(
         filtered_pdf_files = []
         skipped_count = 0
         
+        parsed_index = _build_parsed_index(output_subfolder)
+        
         for pdf_file in pdf_files:
             # 获取PDF文件名（无后缀）
             pdf_name_without_ext = pdf_file.stem
+            existing_outputs = parsed_index.get(pdf_name_without_ext)
             
-            # 检查输出目录中是否已经存在对应的解析结果文件夹
-            output_pdf_dir = output_subfolder / pdf_name_without_ext
-            
-            if output_pdf_dir.exists() and output_pdf_dir.is_dir():
-                # 检查vlm子文件夹中是否包含解析结果文件
-                vlm_dir = output_pdf_dir / 'vlm'
-                has_results = False
-                
-                if vlm_dir.exists() and vlm_dir.is_dir():
-                    # 检查vlm子文件夹中的解析结果文件
-                    for result_file in vlm_dir.iterdir():
-                        if result_file.is_file() and result_file.suffix in ['.md', '.json', '.txt']:
-                            has_results = True
-                            break
-                else:
-                    # vlm子文件夹不存在，记录调试信息
-                    logger.debug(f"  - {pdf_name_without_ext} 的vlm子文件夹不存在: {vlm_dir}")
-                
-                if has_results:
-                    logger.info(f"  ✓ {pdf_name_without_ext} 已解析完成（vlm子文件夹中有结果文件），跳过")
+            if existing_outputs is not None:
+                # 与do_parse使用相同的判断：所有启用的输出文件都已存在才视为解析完成
+                missing_outputs = expected_output_names(pdf_name_without_ext, parsing_config) - existing_outputs
+                if not missing_outputs:
+                    logger.info(f"  ✓ {pdf_name_without_ext} 已解析完成（vlm子文件夹中有全部结果文件），跳过")
                     skipped_count += 1
                     continue
-                else:
-                    logger.info(f"  ? {pdf_name_without_ext} 输出目录存在但vlm子文件夹中无结果文件，将重新解析")
+                logger.info(f"  ? {pdf_name_without_ext} 输出目录存在但vlm子文件夹中缺少 {len(missing_outputs)} 个结果文件，将重新解析")
             
             filtered_pdf_files.append(pdf_file)
         
@@ -192,12 +219,6 @@ def process_folder_structure(
         except Exception as e:
             logger.error(f"处理文件夹 {subfolder.name} 时发生错误: {str(e)}")
             continue
-        
-        # 在文件夹之间添加短暂休息
-        if folder_idx < len(sorted_subfolders) - 1:
-            logger.info("等待3秒后处理下一个文件夹...")
-            import time
-            time.sleep(3)
     
     # 输出最终统计信息
     logger.info("=== 处理完成统计 ===")
@@ -246,13 +267,16 @@ def main():
         logger.info(f"  {key}: {value}")
     
     # 开始处理文件夹结构
+    # 整个运行共用一个后处理进程池，退出时等待所有后处理完成
     logger.info("开始按文件夹结构处理PDF文件...")
-    process_folder_structure(
-        input_root_dir=input_root_dir,
-        output_root_dir=output_root_dir,
-        batch_size=BATCH_SIZE,
-        **PARSING_CONFIG
-    )
+    with PostprocessPool() as postprocess_pool:
+        process_folder_structure(
+            input_root_dir=input_root_dir,
+            output_root_dir=output_root_dir,
+            batch_size=BATCH_SIZE,
+            postprocess_pool=postprocess_pool,
+            **PARSING_CONFIG
+        )
     
     logger.info("=== 所有处理完成 ===")
     logger.info(f"详细日志请查看: {log_file}")